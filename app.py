@@ -2,18 +2,26 @@ import streamlit as st
 import os
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
+import queue
+import random
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from dotenv import dotenv_values
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import ClientAuthenticationError, HttpResponseError
+from azure.core.pipeline.transport import RequestsTransport
 from azure.ai.documentintelligence import DocumentIntelligenceAdministrationClient
 from azure.identity import DefaultAzureCredential, CredentialUnavailableError
 from azure.keyvault.secrets import SecretClient
-
-# Load environment variables from .env file
-load_dotenv()
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -25,100 +33,379 @@ st.set_page_config(
 st.title("Azure Document Intelligence Model Manager")
 st.write("A tool to list and copy custom models between Document Intelligence resources.")
 st.info("This tool uses `DefaultAzureCredential` to access Key Vault. For local development, please ensure you are logged in via the Azure CLI (`az login`).")
-st.info("Configuration is loaded from the `.env` file.")
+st.info("Configuration is loaded from the `.env` file when the app starts. Restart the app (or clear the cache) after editing it.")
 
 # --- Helper Functions ---
-@st.cache_resource
+@st.cache_resource(show_spinner=False)
+def get_logger(level_name):
+    """
+    Returns the app logger at the configured LOG_LEVEL `level_name` (default INFO; DEBUG adds
+    per-poll copy status).
+    Records are handed to a QueueListener thread, so formatting and console writes don't
+    block the script or copy worker threads.
+    The logger outlives the cache, so clearing it must not add another handler and listener.
+    """
+    app_logger = logging.getLogger("di_model_manager")
+    if not app_logger.handlers:
+        log_queue = queue.SimpleQueue()
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        QueueListener(log_queue, console).start()
+        app_logger.addHandler(QueueHandler(log_queue))
+        app_logger.propagate = False
+    level_name = (level_name or "INFO").upper()
+    level = logging.getLevelName(level_name)
+    if isinstance(level, int):
+        app_logger.setLevel(level)
+    else:
+        # An unrecognized LOG_LEVEL shouldn't stop the app from loading
+        app_logger.setLevel(logging.INFO)
+        app_logger.warning("Unknown LOG_LEVEL '%s'; using INFO", level_name)
+    return app_logger
+
+@st.cache_resource(show_spinner=False)
+def get_default_credential():
+    """
+    Returns a process-wide DefaultAzureCredential.
+    Sharing one instance avoids re-probing the credential chain and lets its token cache
+    serve every Key Vault.
+    """
+    return DefaultAzureCredential()
+
+@st.cache_resource(show_spinner=False)
+def get_http_transport():
+    """
+    Returns a process-wide RequestsTransport shared by every Azure SDK client, so Key Vault
+    and Document Intelligence calls reuse pooled TCP/TLS connections instead of each client
+    opening its own.
+    """
+    return RequestsTransport()
+
+# (connect, read) timeouts for the copy REST calls: unreachable endpoints fail fast,
+# while slow service responses still get the full read window
+HTTP_TIMEOUT = (3.05, 30)
+
+def _create_http_session(retry):
+    """Creates a requests.Session with a pooled HTTPS adapter that retries according to `retry`."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry))
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """
+    Returns a process-wide requests.Session for the copy status polls, so they reuse pooled
+    connections. Polls are idempotent GETs, so connection and read errors, throttling (429)
+    and transient 5xx responses are all retried with backoff, honoring Retry-After.
+    """
+    return _create_http_session(Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ))
+
+@st.cache_resource(show_spinner=False)
+def get_http_post_session():
+    """
+    Returns a process-wide requests.Session for the authorizeCopy and copyTo POSTs.
+    copyTo is not idempotent: a POST that may have been processed (read error, 500/502/504)
+    is never resent, or a copy that did start would be reported as failed. Only failed
+    connections and responses saying the request was not processed are retried: 429, and
+    413/503 when they carry Retry-After.
+    """
+    return _create_http_session(Retry(
+        total=3,
+        read=0,
+        other=0,
+        backoff_factor=0.5,
+        status_forcelist=[429],
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ))
+
+@st.cache_resource(show_spinner=False)
+def _create_secret_client(key_vault_url):
+    """
+    Creates a SecretClient for a normalized Key Vault URL.
+    No connectivity probe is made here; authentication problems surface on the first get_secret.
+    """
+    logger.info("🔑 Connecting to Key Vault: %s", key_vault_url)
+    return SecretClient(vault_url=key_vault_url, credential=get_default_credential(), transport=get_http_transport())
+
 def get_secret_client(key_vault_url):
-    """Creates and returns a SecretClient using DefaultAzureCredential."""
-    try:
-        print(f"🔑 Connecting to Key Vault: {key_vault_url}")
-        credential = DefaultAzureCredential()
-        client = SecretClient(vault_url=key_vault_url, credential=credential)
-        
-        # Test the connection by trying to list secrets (this will fail if no permissions, but connection works)
-        try:
-            # This will test if we can authenticate to the Key Vault
-            list(client.list_properties_of_secrets(max_page_size=1))
-            print("✅ Successfully connected to Key Vault with DefaultAzureCredential")
-        except Exception as perm_error:
-            print(f"⚠️ Connected to Key Vault but may have limited permissions: {perm_error}")
-            
-        return client
-    except CredentialUnavailableError:
+    """
+    Returns the cached SecretClient for a Key Vault, using the shared DefaultAzureCredential.
+    Makes no st.* calls so it is safe from worker threads; failures are raised to the caller.
+    """
+    # Normalize so "https://x/" and "https://x" share one cached client
+    return _create_secret_client(key_vault_url.rstrip('/').lower())
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_secret(key_vault_url, secret_name):
+    """
+    Fetches a secret value from Key Vault, cached per (vault, secret) for 10 minutes so
+    repeated button clicks don't round-trip to Key Vault. Raises on failure so errors aren't cached.
+    """
+    secret = get_secret_client(key_vault_url).get_secret(secret_name)
+    logger.info("✅ Successfully retrieved secret '%s' from Key Vault", secret_name)
+    # Part of a key never reaches the log at the default level; only show first few characters when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        masked_value = secret.value[:8] + "..." if len(secret.value) > 8 else "***"
+        logger.debug("Secret value starts with: %s", masked_value)
+    return secret.value
+
+def _show_secret_error(secret_name, error):
+    """Reports a Key Vault secret retrieval failure in the UI."""
+    if isinstance(error, CredentialUnavailableError):
         st.error("❌ Azure credential not available. Please log in via Azure CLI (`az login`).")
-        return None
-    except Exception as e:
-        st.error(f"❌ Failed to connect to Key Vault '{key_vault_url}': {e}")
-        return None
+    else:
+        st.error(f"❌ Failed to retrieve secret '{secret_name}': {error}")
 
-def get_api_key_from_kv(kv_client, secret_name):
-    """Fetches a secret from Azure Key Vault."""
-    if not kv_client or not secret_name:
+def get_api_key_from_kv(key_vault_url, secret_name):
+    """Fetches a secret from Azure Key Vault (cached), reporting failures in the UI."""
+    if not key_vault_url or not secret_name:
         return None
     try:
-        secret = kv_client.get_secret(secret_name)
-        print(f"✅ Successfully retrieved secret '{secret_name}' from Key Vault")
-        # Only show first few characters for security
-        masked_value = secret.value[:8] + "..." if len(secret.value) > 8 else "***"
-        print(f"Secret value starts with: {masked_value}")
-        return secret.value
+        return _fetch_secret(key_vault_url, secret_name)
     except Exception as e:
-        st.error(f"❌ Failed to retrieve secret '{secret_name}': {e}")
+        _show_secret_error(secret_name, e)
         return None
 
-def test_di_connection(di_client):
-    """Test the Document Intelligence client connection."""
-    try:
-        # Try to get resource details - this is a lightweight operation
-        resource_details = di_client.get_resource_details()
-        print(f"✅ Document Intelligence connection successful!")
-        print(f"📊 Resource details: Custom models limit: {resource_details.custom_document_models.limit}, Used: {resource_details.custom_document_models.count}")
-        return True
-    except ClientAuthenticationError as auth_error:
-        st.error(f"❌ Authentication failed: {auth_error}")
+def get_api_keys_from_kv(secret_refs):
+    """
+    Fetches several secrets from Azure Key Vault concurrently.
+    
+    Args:
+        secret_refs: List of (key_vault_url, secret_name) pairs
+        
+    Returns:
+        list: The secret values in the same order, with None for any that failed or whose Key Vault
+              URL or secret name is not set (like get_api_key_from_kv, nothing is fetched for those).
+              Failures are reported from the calling thread, since worker threads can't write to the page.
+    """
+    ctx = get_script_run_ctx()
+
+    def fetch(secret_ref):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return _fetch_secret(*secret_ref)
+
+    with ThreadPoolExecutor(max_workers=len(secret_refs)) as executor:
+        futures = [
+            executor.submit(fetch, (key_vault_url, secret_name)) if key_vault_url and secret_name else None
+            for key_vault_url, secret_name in secret_refs
+        ]
+
+    keys = []
+    for (_, secret_name), future in zip(secret_refs, futures):
+        if future is None:
+            keys.append(None)
+            continue
+        try:
+            keys.append(future.result())
+        except Exception as e:
+            _show_secret_error(secret_name, e)
+            keys.append(None)
+    return keys
+
+# Troubleshooting hints for Document Intelligence HTTP errors, keyed by status code
+DI_HTTP_ERROR_HINTS = {
+    401: "🔍 401 Unauthorized - Check your API key",
+    403: "🔍 403 Forbidden - Check your permissions",
+    404: "🔍 404 Not Found - Check your endpoint URL",
+}
+
+def show_di_error(error):
+    """
+    Reports a Document Intelligence authentication or HTTP error with a troubleshooting hint.
+    Authentication failures also drop the cached secrets, so a rotated key is re-read from
+    Key Vault on the next attempt instead of after the cache TTL.
+    """
+    if isinstance(error, ClientAuthenticationError) or getattr(error, "status_code", None) == 401:
+        _fetch_secret.clear()
+    if isinstance(error, ClientAuthenticationError):
+        st.error(f"❌ Authentication failed: {error}")
         st.error("🔍 This usually means the API key is incorrect or the endpoint URL is wrong.")
-        return False
-    except HttpResponseError as http_error:
-        st.error(f"❌ HTTP Error: {http_error}")
-        if "401" in str(http_error):
-            st.error("🔍 401 Unauthorized - Check your API key")
-        elif "403" in str(http_error):
-            st.error("🔍 403 Forbidden - Check your permissions") 
-        elif "404" in str(http_error):
-            st.error("🔍 404 Not Found - Check your endpoint URL")
-        return False
-    except Exception as e:
-        st.error(f"❌ Connection test failed: {e}")
-        return False
+        return
+    st.error(f"❌ HTTP Error: {error}")
+    hint = DI_HTTP_ERROR_HINTS.get(getattr(error, "status_code", None))
+    if hint:
+        st.error(hint)
 
+@st.cache_resource(show_spinner=False, max_entries=8)
 def get_admin_client(endpoint, key):
-    """Creates and returns a DocumentIntelligenceAdministrationClient."""
-    if not endpoint or not key:
-        st.error("❌ Missing endpoint or key for DI client creation")
-        return None
-    try:
-        print(f"🔗 Creating DI client for endpoint: {endpoint}")
-        client = DocumentIntelligenceAdministrationClient(endpoint=endpoint, credential=AzureKeyCredential(key))
-        print("✅ Successfully created DocumentIntelligence client")
-        return client
-    except Exception as e:
-        st.error(f"❌ Failed to create DI client for endpoint {endpoint}: {e}")
-        return None
+    """
+    Creates a DocumentIntelligenceAdministrationClient, cached per (endpoint, key) so the
+    HTTP pipeline and connection pool are reused across Streamlit reruns.
+    Bounded to a few entries so rotated keys don't accumulate stale clients.
+    Kept free of st.* calls; failures are raised to the caller.
+    """
+    logger.info("🔗 Creating DI client for endpoint: %s", endpoint)
+    client = DocumentIntelligenceAdministrationClient(
+        endpoint=endpoint, credential=AzureKeyCredential(key), transport=get_http_transport()
+    )
+    logger.info("✅ Successfully created DocumentIntelligence client")
+    return client
+
+# Model ID prefixes of service-provided models, which are never listed or copied
+PREBUILT_MODEL_PREFIXES = ('prebuilt-',)
+# Sort key for models without a creation time, so they list last
+OLDEST_CREATED_DATE_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_custom_models(endpoint, key):
+    """
+    Lists the custom (non-prebuilt) models on a resource, cached per (endpoint, key) for 5 minutes.
+    The cache is process-wide, so new browser sessions reuse it instead of re-listing.
+    Models are returned newest first as small dicts rather than SDK objects, so they pickle
+    cheaply into the cache and session state and are sorted once per listing instead of on
+    every rerun. Raises on failure so errors aren't cached.
+    """
+    di_client = get_admin_client(endpoint, key)
+    custom_models = []
+    for page in di_client.list_models().by_page():
+        custom_models.extend(
+            {
+                "model_id": m.model_id,
+                "created_date_time": m.created_date_time,
+                # Display string formatted once here rather than on every rerun
+                "created_date": m.created_date_time.strftime('%Y-%m-%d %H:%M') if m.created_date_time else 'Unknown',
+                "api_version": m.api_version,
+            }
+            for m in page if not m.model_id.startswith(PREBUILT_MODEL_PREFIXES)
+        )
+    custom_models.sort(
+        key=lambda m: m['created_date_time'] or OLDEST_CREATED_DATE_TIME,
+        reverse=True
+    )
+    return custom_models
+
+def list_custom_models_concurrently(resources):
+    """
+    Lists custom models on several resources concurrently.
+    
+    Args:
+        resources: List of (endpoint, key) pairs
+        
+    Returns:
+        list: (models, error) per resource in the same order; error is None on success.
+              Errors are returned rather than shown, since worker threads can't write to the page.
+    """
+    ctx = get_script_run_ctx()
+
+    def fetch(resource):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return list_custom_models(*resource)
+
+    with ThreadPoolExecutor(max_workers=max(len(resources), 1)) as executor:
+        futures = [executor.submit(fetch, resource) for resource in resources]
+
+    results = []
+    for future in futures:
+        try:
+            results.append((future.result(), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+def show_model_details(models):
+    """Renders a model list as a single dataframe rather than one st.write per model."""
+    details_df = pd.DataFrame({
+        "Model ID": [model['model_id'] for model in models],
+        "Created": [model['created_date'] for model in models],
+    })
+    st.dataframe(details_df, use_container_width=True, hide_index=True)
+
+# Target status columns hold one of three values, so store them as categories rather than
+# a string per cell; this also ships to the browser as a compact dictionary-encoded column
+MODEL_STATUS_DTYPE = pd.CategoricalDtype(["✅ Exists", "❌ Not Found", "❓ Unknown"])
+
+@st.cache_data(show_spinner=False)
+def build_model_table(models, target_columns):
+    """
+    Builds the copy selection table with one row per model and a status column per target.
+    Columns are built whole rather than row by row, and the result is cached so reruns from
+    unrelated widgets reuse it.
+    
+    Args:
+        models: Model dicts from list_custom_models, in display order
+        target_columns: Tuple of (column name, frozenset of model IDs in that target, or None if not checked yet)
+    """
+    model_ids = [model['model_id'] for model in models]
+    df = pd.DataFrame({
+        'Select': False,
+        'Model ID': model_ids,
+        'Created Date': [model['created_date'] for model in models],
+        'Target ID': model_ids,  # Default to same name as source
+    })
+    for column_name, target_model_ids in target_columns:
+        if target_model_ids is None:
+            status = pd.Series("❓ Unknown", index=df.index)
+        else:
+            status = df['Model ID'].isin(target_model_ids).map({True: "✅ Exists", False: "❌ Not Found"})
+        df[column_name] = status.astype(MODEL_STATUS_DTYPE)
+    return df
+
+@st.cache_data(show_spinner=False)
+def model_table_column_config(target_names):
+    """
+    Builds the data editor column configuration for the copy selection table.
+    Cached per tuple of target names, since the targets only change on restart.
+    
+    Returns:
+        tuple: (column_config dict, list of disabled column names)
+    """
+    column_config = {
+        "Select": st.column_config.CheckboxColumn(
+            "Select",
+            help="Check to select models for copying",
+            default=False,
+        ),
+        "Model ID": st.column_config.TextColumn(
+            "Model ID",
+            help="Source model identifier",
+            disabled=True,
+        ),
+        "Created Date": st.column_config.TextColumn(
+            "Created Date",
+            help="When the model was created",
+            disabled=True,
+        ),
+        "Target ID": st.column_config.TextColumn(
+            "Target ID",
+            help="Target model identifier (will be updated based on suffix)",
+            disabled=True,
+        ),
+    }
+    
+    # Add status columns for each configured target
+    disabled_columns = ["Model ID", "Created Date", "Target ID"]
+    for target_name in target_names:
+        column_name = f"{target_name} Status"
+        column_config[column_name] = st.column_config.TextColumn(
+            column_name,
+            help=f"Model existence status in {target_name}",
+            disabled=True,
+        )
+        disabled_columns.append(column_name)
+    return column_config, disabled_columns
 
 def get_api_version_from_model(model):
     """
     Determine the appropriate API version based on the model's api_version property.
     
     Args:
-        model: The model object from list_models
+        model: The model dict from list_custom_models
         
     Returns:
         str: The API version to use for copy operations ("2024-11-30" or "2023-07-31")
     """
-    # Check if the model has an api_version attribute
-    if hasattr(model, 'api_version') and model.api_version:
-        model_api_version = model.api_version
+    # Check if the model has an api_version recorded
+    model_api_version = model.get("api_version")
+    if model_api_version:
         # If the model was built with API version 2024-11-30 or later, use the new API
         if model_api_version >= "2024-11-30":
             return "2024-11-30"
@@ -126,6 +413,23 @@ def get_api_version_from_model(model):
     # Default to the older API version for backward compatibility
     return "2023-07-31"
 
+# REST path prefix per copy API version: 2024-11-30 moved documentModels from formrecognizer
+# to documentintelligence. Covers every version get_api_version_from_model returns.
+DI_PATH_PREFIX_BY_API_VERSION = {
+    "2024-11-30": "documentintelligence",
+    "2023-07-31": "formrecognizer",
+}
+# Versions not in the table are placed by date: every API version from the 2023-10-31 preview
+# on serves documentModels under documentintelligence/
+DI_PATH_FIRST_DOCUMENTINTELLIGENCE_VERSION = "2023-10-31"
+
+def build_di_url(endpoint, api_version, path):
+    """Builds a Document Intelligence REST URL for `path` under the prefix that matches `api_version`."""
+    path_prefix = DI_PATH_PREFIX_BY_API_VERSION.get(api_version) or (
+        "documentintelligence" if api_version >= DI_PATH_FIRST_DOCUMENTINTELLIGENCE_VERSION else "formrecognizer"
+    )
+    return f"{endpoint}/{path_prefix}/{path}?api-version={api_version}"
+
 def authorize_copy_model(target_endpoint, target_key, model_id, description="", api_version="2023-07-31"):
     """
     Authorize a model copy operation on the target endpoint.
@@ -140,15 +444,7 @@ def authorize_copy_model(target_endpoint, target_key, model_id, description="",
                      should use "2024-11-30" which uses the documentintelligence path.
                      Older models use "2023-07-31" with the formrecognizer path.
     """
-    # Use the appropriate path based on API version
-    # API version 2024-11-30+ uses documentintelligence/documentModels
-    # Older API versions use formrecognizer/documentModels
-    if api_version >= "2024-11-30":
-        path_prefix = "documentintelligence"
-    else:
-        path_prefix = "formrecognizer"
-    
-    url = f"{target_endpoint}/{path_prefix}/documentModels:authorizeCopy?api-version={api_version}"
+    url = build_di_url(target_endpoint, api_version, "documentModels:authorizeCopy")
     headers = {
         "Ocp-Apim-Subscription-Key": target_key,
         "Content-Type": "application/json"
@@ -159,24 +455,24 @@ def authorize_copy_model(target_endpoint, target_key, model_id, description="",
     }
     
     try:
-        print(f"🔑 Authorizing copy for model '{model_id}' on target endpoint")
-        response = requests.post(url, headers=headers, json=body, timeout=30)
+        logger.info("🔑 Authorizing copy for model '%s' on target endpoint", model_id)
+        response = get_http_post_session().post(url, headers=headers, json=body, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
         auth_result = response.json()
-        print(f"✅ Copy authorization successful for model '{model_id}'")
-        print(f"Target Resource ID: {auth_result.get('targetResourceId', 'N/A')}")
+        logger.info("✅ Copy authorization successful for model '%s'", model_id)
+        logger.info("Target Resource ID: %s", auth_result.get('targetResourceId', 'N/A'))
         return auth_result
         
     except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to authorize copy for model '{model_id}': {e}")
+        logger.error("❌ Failed to authorize copy for model '%s': %s", model_id, e)
         if hasattr(e, 'response') and e.response is not None:
             try:
                 error_detail = e.response.json()
-                print(f"Error details: {error_detail}")
-                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}"}
+                logger.error("Error details: %s", error_detail)
+                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}", "status_code": e.response.status_code}
             except:
-                return {"error": f"HTTP {e.response.status_code}: {str(e)}"}
+                return {"error": f"HTTP {e.response.status_code}: {str(e)}", "status_code": e.response.status_code}
         return {"error": str(e)}
 
 def copy_model_to_target(source_endpoint, source_key, source_model_id, copy_authorization, api_version="2023-07-31"):
@@ -193,160 +489,331 @@ def copy_model_to_target(source_endpoint, source_key, source_model_id, copy_auth
                      should use "2024-11-30" which uses the documentintelligence path.
                      Older models use "2023-07-31" with the formrecognizer path.
     """
-    # Use the appropriate path based on API version
-    # API version 2024-11-30+ uses documentintelligence/documentModels
-    # Older API versions use formrecognizer/documentModels
-    if api_version >= "2024-11-30":
-        path_prefix = "documentintelligence"
-    else:
-        path_prefix = "formrecognizer"
-    
-    url = f"{source_endpoint}/{path_prefix}/documentModels/{source_model_id}:copyTo?api-version={api_version}"
+    url = build_di_url(source_endpoint, api_version, f"documentModels/{source_model_id}:copyTo")
     headers = {
         "Ocp-Apim-Subscription-Key": source_key,
         "Content-Type": "application/json"
     }
     
     try:
-        print(f"📋 Initiating copy operation for model '{source_model_id}' from source endpoint")
-        response = requests.post(url, headers=headers, json=copy_authorization, timeout=30)
+        logger.info("📋 Initiating copy operation for model '%s' from source endpoint", source_model_id)
+        response = get_http_post_session().post(url, headers=headers, json=copy_authorization, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
-        # Get the operation location from the response headers
-        operation_location = response.headers.get('Operation-Location')
+        # Get the operation location from the response headers (some services only send Azure-AsyncOperation)
+        operation_location = response.headers.get('Operation-Location') or response.headers.get('Azure-AsyncOperation')
         if operation_location:
-            print(f"✅ Copy operation initiated successfully")
-            print(f"Operation Location: {operation_location}")
+            logger.info("✅ Copy operation initiated successfully")
+            logger.info("Operation Location: %s", operation_location)
             return {"operation_location": operation_location, "status": "initiated"}
         else:
-            print("⚠️ Copy operation response received but no Operation-Location header found")
-            return {"error": "No Operation-Location header in response"}
+            logger.warning("⚠️ Copy operation response received but no Operation-Location or Azure-AsyncOperation header found")
+            return {"error": "No Operation-Location or Azure-AsyncOperation header in response"}
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to initiate copy for model '{source_model_id}': {e}")
+        logger.error("❌ Failed to initiate copy for model '%s': %s", source_model_id, e)
         if hasattr(e, 'response') and e.response is not None:
             try:
                 error_detail = e.response.json()
-                print(f"Error details: {error_detail}")
-                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}"}
+                logger.error("Error details: %s", error_detail)
+                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}", "status_code": e.response.status_code}
             except:
-                return {"error": f"HTTP {e.response.status_code}: {str(e)}"}
+                return {"error": f"HTTP {e.response.status_code}: {str(e)}", "status_code": e.response.status_code}
         return {"error": str(e)}
 
 def check_copy_status(operation_location, api_key):
     """
     Check the status of a copy operation using the operation location URL.
-    Returns the current status of the copy operation.
+    Returns the current status of the copy operation, with 'retry_after' (seconds) added when
+    the service sends a Retry-After header.
     """
     headers = {
         "Ocp-Apim-Subscription-Key": api_key
     }
     
     try:
-        print(f"🔍 Checking copy operation status: {operation_location}")
-        response = requests.get(operation_location, headers=headers, timeout=30)
+        logger.debug("🔍 Checking copy operation status: %s", operation_location)
+        response = get_http_session().get(operation_location, headers=headers, timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         
         status_result = response.json()
+        # Surface the service's suggested poll interval alongside the operation state
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            status_result['retry_after'] = int(retry_after)
         status = status_result.get('status', 'unknown')
-        print(f"📊 Copy operation status: {status}")
+        logger.debug("📊 Copy operation status: %s", status)
         
         if status.lower() == 'succeeded':
-            print(f"✅ Copy operation completed successfully")
+            logger.info("✅ Copy operation completed successfully")
             if 'result' in status_result:
-                print(f"Result: {status_result['result']}")
+                logger.info("Result: %s", status_result['result'])
         elif status.lower() == 'failed':
-            print(f"❌ Copy operation failed")
+            logger.error("❌ Copy operation failed")
             if 'error' in status_result:
-                print(f"Error: {status_result['error']}")
+                logger.error("Error: %s", status_result['error'])
         elif status.lower() in ['running', 'notstarted']:
-            print(f"⏳ Copy operation still in progress...")
+            logger.debug("⏳ Copy operation still in progress...")
         
         return status_result
         
     except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to check copy status: {e}")
+        logger.error("❌ Failed to check copy status: %s", e)
         if hasattr(e, 'response') and e.response is not None:
             try:
                 error_detail = e.response.json()
-                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}"}
+                return {"error": f"HTTP {e.response.status_code}: {error_detail.get('error', {}).get('message', str(e))}", "status_code": e.response.status_code}
             except:
-                return {"error": f"HTTP {e.response.status_code}: {str(e)}"}
+                return {"error": f"HTTP {e.response.status_code}: {str(e)}", "status_code": e.response.status_code}
         return {"error": str(e)}
 
-# --- Get configuration from environment variables ---
-source_endpoint = os.getenv("SOURCE_ENDPOINT")
-source_kv_url = os.getenv("SOURCE_KV_URL")
-source_secret_name = os.getenv("SOURCE_SECRET_NAME")
-
-# Target environment configurations
-target1_endpoint = os.getenv("TARGET1_ENDPOINT")
-target1_kv_url = os.getenv("TARGET1_KV_URL")
-target1_secret_name = os.getenv("TARGET1_SECRET_NAME")
-target1_name = os.getenv("TARGET1_NAME", "Target 1")
-
-target2_endpoint = os.getenv("TARGET2_ENDPOINT")
-target2_kv_url = os.getenv("TARGET2_KV_URL")
-target2_secret_name = os.getenv("TARGET2_SECRET_NAME")
-target2_name = os.getenv("TARGET2_NAME", "Target 2")
-
-target3_endpoint = os.getenv("TARGET3_ENDPOINT")
-target3_kv_url = os.getenv("TARGET3_KV_URL")
-target3_secret_name = os.getenv("TARGET3_SECRET_NAME")
-target3_name = os.getenv("TARGET3_NAME", "Target 3")
+# Upper bound on copy operations running at once, to stay well inside DI request limits
+MAX_CONCURRENT_COPIES = 10
+# Copy status polling backs off exponentially from the base delay up to the cap (seconds)
+POLL_BASE_DELAY = 0.25
+POLL_MAX_DELAY = 8
+# How long a copy run keeps polling before reporting the remaining copies as timed out (seconds)
+COPY_TIMEOUT = 600
 
-# --- Configuration Validation ---
-st.subheader("🔧 Configuration Status")
-config_col1, config_col2 = st.columns([1, 2])
+def start_copy_operation(source_endpoint, source_key, target_endpoint, target_key, model_id, new_model_id, api_version):
+    """
+    Authorizes a copy on the target and starts it from the source.
+    
+    Returns:
+        dict: {"operation_location": url} once the service has accepted the copy, otherwise
+              {"error": message, "status_code": HTTP status of the failed request, or None}
+    """
+    copy_auth = authorize_copy_model(target_endpoint, target_key, new_model_id, f"Copied from {source_endpoint} {model_id}", api_version)
+    if "error" in copy_auth:
+        return {"error": f"Authorization failed: {copy_auth['error']}", "status_code": copy_auth.get("status_code")}
 
-with config_col1:
-    st.write("**Source Configuration:**")
-    st.write(f"✅ Endpoint: {source_endpoint}" if source_endpoint else "❌ SOURCE_ENDPOINT not set")
-    st.write(f"✅ Key Vault: {source_kv_url}" if source_kv_url else "❌ SOURCE_KV_URL not set")
-    st.write(f"✅ Secret Name: {source_secret_name}" if source_secret_name else "❌ SOURCE_SECRET_NAME not set")
+    copy_result = copy_model_to_target(source_endpoint, source_key, model_id, copy_auth, api_version)
+    if "error" in copy_result:
+        return {"error": f"Copy initiation failed: {copy_result['error']}", "status_code": copy_result.get("status_code")}
+    return {"operation_location": copy_result["operation_location"]}
 
-with config_col2:
-    st.write("**Target Environments Configuration:**")
+def copy_status_outcome(status_result):
+    """
+    Maps a check_copy_status result to a final outcome, or None while the copy is still running.
+    A failed request ends the operation straight away: throttling and 5xx responses have
+    already been retried by the HTTP session, so what remains is not worth polling again.
+    """
+    status = str(status_result.get('status', '')).strip().lower()
+    if status == 'succeeded':
+        return {"status": "succeeded"}
+    if status == 'failed':
+        # A failed operation carries its own error object, so check it before request errors
+        error_info = status_result.get('error', {})
+        if isinstance(error_info, dict):
+            return {"error": error_info.get('message', 'Unknown error')}
+        return {"error": str(error_info)}
+    if "error" in status_result:
+        return {"error": f"Status check failed: {status_result['error']}", "status_code": status_result.get("status_code")}
+    return None
+
+def run_copy_operations(source_endpoint, source_key, operations, timeout=COPY_TIMEOUT):
+    """
+    Copies many models, yielding each operation's outcome as soon as it is known.
+    Every copy is started first so the service runs them side by side, then all pending
+    operations are polled together in concurrent sweeps with exponential backoff and full
+    jitter (or the service's Retry-After) until they finish or `timeout` seconds pass.
+    Makes no st.* calls; the caller reports each outcome from the main thread. Closing the
+    generator cancels the copies that have not been started yet.
     
-    # Target 1
-    target1_status = "✅" if all([target1_endpoint, target1_kv_url, target1_secret_name]) else "❌"
-    st.write(f"{target1_status} **{target1_name}:** {target1_endpoint or 'Not configured'}")
+    Args:
+        source_endpoint: The source Document Intelligence endpoint URL
+        source_key: The API key for the source endpoint, which also serves the status polls
+        operations: List of (target_config, target_key, model_id, new_model_id, api_version)
+        
+    Yields:
+        tuple: (operation, result) where result is {"status": "succeeded"} or {"error": message},
+               with "status_code" set when the error came from an HTTP response. Each copy the
+               service accepts is also yielded once with result None when it starts.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(min(MAX_CONCURRENT_COPIES, len(operations)), 1))
+    try:
+        futures = {
+            executor.submit(
+                start_copy_operation, source_endpoint, source_key, target_config.endpoint, target_key,
+                model_id, new_model_id, api_version,
+            ): (target_config, target_key, model_id, new_model_id, api_version)
+            for target_config, target_key, model_id, new_model_id, api_version in operations
+        }
+        # Keyed by start future rather than location, so two operations reporting the same
+        # Operation-Location can't overwrite each other's outcome
+        pending = {}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"error": str(e)}
+            if "error" in result:
+                yield futures[future], result
+            else:
+                pending[future] = result["operation_location"]
+                # Hand control back after every start, so the caller's next st.* call can notice
+                # a Stop or rerun before the remaining copies are started
+                yield futures[future], None
+
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while pending:
+            polled = list(pending.items())
+            status_results = executor.map(lambda item: check_copy_status(item[1], source_key), polled)
+            retry_after = 0
+            for (future, _), status_result in zip(polled, status_results):
+                outcome = copy_status_outcome(status_result)
+                if outcome is None:
+                    retry_after = max(retry_after, status_result.get('retry_after', 0))
+                else:
+                    del pending[future]
+                    yield futures[future], outcome
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                for future in pending:
+                    yield futures[future], {"error": "Copy operation timed out"}
+                return
+            delay = retry_after or random.uniform(0, min(POLL_BASE_DELAY * 2 ** attempt, POLL_MAX_DELAY))
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            attempt += 1
+    finally:
+        # Also runs when the caller closes the generator (Stop or a rerun): starts still queued
+        # in the pool are cancelled instead of authorizing and starting more copies
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# Result labels used in the copy records and results table
+COPY_SUCCEEDED = "✅ Copied"
+COPY_FAILED = "❌ Failed"
+
+def copy_results_frame(copy_results, target_names):
+    """
+    Turns the flat copy records into one DataFrame (failures first, then by target), so a
+    large run is sent to the browser as a single sortable table instead of a line per model.
     
-    # Target 2
-    target2_status = "✅" if all([target2_endpoint, target2_kv_url, target2_secret_name]) else "❌"
-    st.write(f"{target2_status} **{target2_name}:** {target2_endpoint or 'Not configured'}")
+    Args:
+        copy_results: List of {"Target", "Model ID", "Target ID", "Result", "Error"} records from the copy run
+        target_names: Names of the selected targets, in display order
+    """
+    frame = pd.DataFrame(copy_results, columns=["Target", "Model ID", "Target ID", "Result", "Error"])
+    frame["Target"] = pd.Categorical(frame["Target"], categories=list(dict.fromkeys(target_names)))
+    frame["Result"] = pd.Categorical(frame["Result"], categories=[COPY_FAILED, COPY_SUCCEEDED])
+    return frame.sort_values(["Result", "Target"], kind="stable", ignore_index=True)
+
+def copy_result_counts(results_frame):
+    """Counts failed and copied operations per target (every selected target, even with no rows) in one groupby."""
+    return results_frame.groupby(["Target", "Result"], observed=False).size().unstack(fill_value=0)
+
+def copy_summary_markdown(result_counts, total_operations, total_successful, total_failed):
+    """
+    Builds the copy summary header with overall and per-target counts as one markdown block;
+    the individual results are shown by copy_results_frame.
     
-    # Target 3
-    target3_status = "✅" if all([target3_endpoint, target3_kv_url, target3_secret_name]) else "❌"
-    st.write(f"{target3_status} **{target3_name}:** {target3_endpoint or 'Not configured'}")
-
-# Create target configurations list for easier handling
-target_configs = [
-    {
-        "name": target1_name,
-        "endpoint": target1_endpoint,
-        "kv_url": target1_kv_url,
-        "secret_name": target1_secret_name,
-        "key": "target1"
-    },
-    {
-        "name": target2_name,
-        "endpoint": target2_endpoint,
-        "kv_url": target2_kv_url,
-        "secret_name": target2_secret_name,
-        "key": "target2"
-    },
-    {
-        "name": target3_name,
-        "endpoint": target3_endpoint,
-        "kv_url": target3_kv_url,
-        "secret_name": target3_secret_name,
-        "key": "target3"
-    }
-]
+    Args:
+        result_counts: Per-target counts from copy_result_counts
+        total_operations: Number of model × target operations that were requested
+        total_successful: Number of operations that succeeded
+        total_failed: Number of operations that failed
+    """
+    parts = [
+        "---",
+        "📊 **Multi-Target Copy Operation Summary:**",
+        f"**Overall Results:** {total_successful} successful, {total_failed} failed out of {total_operations} total operations",
+    ]
+    parts.append("\n".join(
+        f"- 🎯 **{target_name}:** ✅ {copied} copied, ❌ {failed} failed"
+        if copied or failed else f"- 🎯 **{target_name}:** No operations performed for this target."
+        for target_name, failed, copied in result_counts[[COPY_FAILED, COPY_SUCCEEDED]].itertuples()
+    ))
+    return "\n\n".join(parts)
+
+# --- Get configuration from environment variables ---
+@dataclass(frozen=True, slots=True)
+class TargetConfig:
+    """Connection settings for one target environment."""
+    key: str
+    name: str
+    endpoint: str | None
+    kv_url: str | None
+    secret_name: str | None
+
+    @property
+    def is_configured(self):
+        """True when the endpoint, Key Vault URL and secret name are all set."""
+        return all([self.endpoint, self.kv_url, self.secret_name])
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Connection settings for the source and the three target environments, read from the environment."""
+    source_endpoint: str | None
+    source_kv_url: str | None
+    source_secret_name: str | None
+    targets: tuple[TargetConfig, ...]
+    configured_targets: tuple[TargetConfig, ...]
+    log_level: str | None
+
+@st.cache_resource(show_spinner=False)
+def get_config():
+    """
+    Reads the configuration from the .env file and the process environment once per process.
+    Streamlit reruns the script on every interaction, so this avoids re-parsing .env each time.
+    The file is read without being loaded into os.environ, so variables set in the real
+    environment take precedence, and clearing the cache picks up edits (including removed keys).
+    """
+    env = {**dotenv_values(), **os.environ}
+    targets = tuple(
+        TargetConfig(
+            key=f"target{n}",
+            name=env.get(f"TARGET{n}_NAME") or f"Target {n}",
+            endpoint=env.get(f"TARGET{n}_ENDPOINT"),
+            kv_url=env.get(f"TARGET{n}_KV_URL"),
+            secret_name=env.get(f"TARGET{n}_SECRET_NAME"),
+        )
+        for n in (1, 2, 3)
+    )
+    return Config(
+        source_endpoint=env.get("SOURCE_ENDPOINT"),
+        source_kv_url=env.get("SOURCE_KV_URL"),
+        source_secret_name=env.get("SOURCE_SECRET_NAME"),
+        targets=targets,
+        configured_targets=tuple(target for target in targets if target.is_configured),
+        log_level=env.get("LOG_LEVEL"),
+    )
 
-# Filter out unconfigured targets
-configured_targets = [config for config in target_configs if all([config["endpoint"], config["kv_url"], config["secret_name"]])]
+cfg = get_config()
+# Created after get_config so LOG_LEVEL can come from the .env file
+logger = get_logger(cfg.log_level)
+
+# --- Configuration Validation ---
+@st.cache_data(show_spinner=False)
+def config_status_markdown(config):
+    """
+    Builds the Configuration Status section as a single markdown table, with source settings
+    and targets side by side. One cached string means one delta per rerun instead of a
+    subheader, columns and a block per column; the configuration only changes on restart.
+    """
+    source_cells = []
+    for label, env_name, value in [
+        ("Endpoint", "SOURCE_ENDPOINT", config.source_endpoint),
+        ("Key Vault", "SOURCE_KV_URL", config.source_kv_url),
+        ("Secret Name", "SOURCE_SECRET_NAME", config.source_secret_name),
+    ]:
+        source_cells.append(f"✅ {label}: {value}" if value else f"❌ {env_name} not set")
+    target_cells = [
+        f"{'✅' if target.is_configured else '❌'} **{target.name}:** {target.endpoint or 'Not configured'}"
+        for target in config.targets
+    ]
+    lines = [
+        "### 🔧 Configuration Status",
+        "| Source Configuration | Target Environments |",
+        "| --- | --- |",
+    ]
+    lines.extend(f"| {source} | {target} |" for source, target in zip(source_cells, target_cells))
+    return "\n".join(lines)
+
+st.markdown(config_status_markdown(cfg))
+
+configured_targets = cfg.configured_targets
 
 if not configured_targets:
     st.warning("⚠️ No target environments are properly configured. Please check your .env file.")
@@ -362,14 +829,26 @@ if 'target_models_lists' not in st.session_state:
     st.session_state.target_models_lists = {}
     # Initialize target model lists for each configured target
     for target_config in configured_targets:
-        st.session_state.target_models_lists[target_config["key"]] = []
+        st.session_state.target_models_lists[target_config.key] = []
+if 'target_model_ids' not in st.session_state:
+    # Model IDs per target, rebuilt only when that target is refreshed rather than on every rerun
+    st.session_state.target_model_ids = {
+        target_key: frozenset(model['model_id'] for model in target_models)
+        for target_key, target_models in st.session_state.target_models_lists.items()
+    }
 
 # --- Unified Model Fetching Section ---
 st.header("🔄 Refresh All Models")
 
-# Single button to fetch all models
-if st.button("🔄 Refresh Models from Source and All Targets", use_container_width=True, type="primary"):
-    if not all([source_endpoint, source_kv_url, source_secret_name]):
+# Single button to fetch all models; the force variant bypasses the cached API keys and model lists
+refresh_col, force_refresh_col = st.columns([3, 1])
+refresh_all = refresh_col.button("🔄 Refresh Models from Source and All Targets", use_container_width=True, type="primary")
+force_refresh = force_refresh_col.button("♻️ Force Refresh", use_container_width=True, help="Re-read API keys from Key Vault (e.g. after a key rotation) and re-list every resource")
+if force_refresh:
+    _fetch_secret.clear()
+    list_custom_models.clear()
+if refresh_all or force_refresh:
+    if not all([cfg.source_endpoint, cfg.source_kv_url, cfg.source_secret_name]):
         st.warning("Please ensure SOURCE_ENDPOINT, SOURCE_KV_URL, and SOURCE_SECRET_NAME are set in your .env file.")
     elif not configured_targets:
         st.warning("No target environments are properly configured. Please check your .env file.")
@@ -380,76 +859,48 @@ if st.button("🔄 Refresh Models from Source and All Targets", use_container_wi
         
         with st.status(f"Fetching models from source and {len(configured_targets)} target environments...", expanded=True) as status:
             try:
-                # --- Fetch Source Models ---
-                current_operation += 1
-                st.write(f"[{current_operation}/{total_operations}] 🎯 **Fetching source models...**")
-                
-                source_kv_client = get_secret_client(source_kv_url)
-                if source_kv_client:
-                    source_key = get_api_key_from_kv(source_kv_client, source_secret_name)
-                    
-                    if source_key:
-                        source_di_client = get_admin_client(source_endpoint, source_key)
-                        if source_di_client:
-                            if test_di_connection(source_di_client):
-                                try:
-                                    models = source_di_client.list_models()
-                                    custom_models = [m for m in models if hasattr(m, 'model_id') and not m.model_id.startswith('prebuilt-')]
-                                    st.session_state.models_list = custom_models
-                                    if st.session_state.models_list:
-                                        st.success(f"✅ Found {len(st.session_state.models_list)} custom models in source")
-                                        print(f"Source models fetched: {[m.model_id for m in st.session_state.models_list]}")
-                                    else:
-                                        st.info("No custom models found on the source resource.")
-                                except Exception as e:
-                                    st.error(f"An error occurred while fetching source models: {e}")
-                            else:
-                                st.error("Cannot proceed with source model listing due to connection issues.")
-                        else:
-                            st.error("Failed to create source DI client.")
-                    else:
-                        st.error("Failed to retrieve source API key.")
-                else:
-                    st.error("Failed to connect to source Key Vault.")
-                
-                # --- Fetch Target Models ---
-                for target_config in configured_targets:
+                # Source first, then targets; keys and model lists are each fetched concurrently
+                resources = [("source", "source", cfg.source_endpoint, cfg.source_kv_url, cfg.source_secret_name)] + [
+                    (t.key, t.name, t.endpoint, t.kv_url, t.secret_name) for t in configured_targets
+                ]
+                st.write(f"🔑 **Retrieving {total_operations} API keys...**")
+                keys = get_api_keys_from_kv([(kv_url, secret_name) for _, _, _, kv_url, secret_name in resources])
+                keyed = [(resource, key) for resource, key in zip(resources, keys) if key]
+                st.write(f"📋 **Listing models on {len(keyed)} resources...**")
+                listed = dict(zip(
+                    [resource[0] for resource, _ in keyed],
+                    list_custom_models_concurrently([(resource[2], key) for resource, key in keyed]),
+                ))
+
+                for resource_key, name, _, _, _ in resources:
                     current_operation += 1
-                    st.write(f"[{current_operation}/{total_operations}] 🎯 **Fetching {target_config['name']} models...**")
-                    
-                    target_kv_client = get_secret_client(target_config['kv_url'])
-                    if target_kv_client:
-                        target_key = get_api_key_from_kv(target_kv_client, target_config['secret_name'])
-                        
-                        if target_key:
-                            target_di_client = get_admin_client(target_config['endpoint'], target_key)
-                            if target_di_client:
-                                if test_di_connection(target_di_client):
-                                    try:
-                                        models = target_di_client.list_models()
-                                        custom_models = [m for m in models if hasattr(m, 'model_id') and not m.model_id.startswith('prebuilt-')]
-                                        st.session_state.target_models_lists[target_config['key']] = custom_models
-                                        if custom_models:
-                                            st.success(f"✅ Found {len(custom_models)} custom models in {target_config['name']}")
-                                            print(f"{target_config['name']} models fetched: {[m.model_id for m in custom_models]}")
-                                        else:
-                                            st.info(f"No custom models found in {target_config['name']}.")
-                                    except Exception as e:
-                                        st.error(f"An error occurred while fetching {target_config['name']} models: {e}")
-                                else:
-                                    st.error(f"Cannot proceed with {target_config['name']} model listing due to connection issues.")
-                            else:
-                                st.error(f"Failed to create DI client for {target_config['name']}.")
+                    st.write(f"[{current_operation}/{total_operations}] 🎯 **{name} models**")
+                    if resource_key not in listed:
+                        st.error(f"Failed to retrieve {name} API key.")
+                        continue
+                    custom_models, error = listed[resource_key]
+                    if error is not None:
+                        if isinstance(error, (ClientAuthenticationError, HttpResponseError)):
+                            show_di_error(error)
                         else:
-                            st.error(f"Failed to retrieve API key for {target_config['name']}.")
+                            st.error(f"An error occurred while fetching {name} models: {error}")
+                        continue
+                    if resource_key == "source":
+                        st.session_state.models_list = custom_models
                     else:
-                        st.error(f"Failed to connect to {target_config['name']} Key Vault.")
+                        st.session_state.target_models_lists[resource_key] = custom_models
+                        st.session_state.target_model_ids[resource_key] = frozenset(m['model_id'] for m in custom_models)
+                    if custom_models:
+                        st.success(f"✅ Found {len(custom_models)} custom models in {name}")
+                        logger.info("%s models fetched: %s", name, [m['model_id'] for m in custom_models])
+                    else:
+                        st.info(f"No custom models found in {name}.")
                 
                 st.write("🎉 **Model refresh completed!**")
                 
             except Exception as e:
                 st.error(f"An unexpected error occurred during model refresh: {e}")
-                print(f"Unexpected error during model refresh: {e}")
+                logger.exception("Unexpected error during model refresh: %s", e)
 
 # --- Environment Details Section ---
 st.header("📊 Environment Details")
@@ -459,43 +910,33 @@ col1, col2 = st.columns(2)
 # --- Source Column ---
 with col1:
     st.subheader("Source Resource")
-    st.write(f"**Endpoint:** `{source_endpoint}`")
-    st.write(f"**Key Vault:** `{source_kv_url}`")
+    st.write(f"**Endpoint:** `{cfg.source_endpoint}`")
+    st.write(f"**Key Vault:** `{cfg.source_kv_url}`")
     
     # Individual refresh button for source
     if st.button("🔄 Refresh Source Models", key="refresh_source", use_container_width=True):
-        if not all([source_endpoint, source_kv_url, source_secret_name]):
+        if not all([cfg.source_endpoint, cfg.source_kv_url, cfg.source_secret_name]):
             st.warning("Please ensure SOURCE_ENDPOINT, SOURCE_KV_URL, and SOURCE_SECRET_NAME are set in your .env file.")
         else:
             with st.spinner("Fetching source models..."):
                 try:
-                    source_kv_client = get_secret_client(source_kv_url)
-                    if source_kv_client:
-                        source_key = get_api_key_from_kv(source_kv_client, source_secret_name)
-                        
-                        if source_key:
-                            source_di_client = get_admin_client(source_endpoint, source_key)
-                            if source_di_client:
-                                if test_di_connection(source_di_client):
-                                    try:
-                                        models = source_di_client.list_models()
-                                        custom_models = [m for m in models if hasattr(m, 'model_id') and not m.model_id.startswith('prebuilt-')]
-                                        st.session_state.models_list = custom_models
-                                        if st.session_state.models_list:
-                                            st.success(f"✅ Found {len(st.session_state.models_list)} custom models in source")
-                                            print(f"Source models fetched: {[m.model_id for m in st.session_state.models_list]}")
-                                        else:
-                                            st.info("No custom models found on the source resource.")
-                                    except Exception as e:
-                                        st.error(f"An error occurred while fetching source models: {e}")
-                                else:
-                                    st.error("Cannot proceed with source model listing due to connection issues.")
+                    source_key = get_api_key_from_kv(cfg.source_kv_url, cfg.source_secret_name)
+
+                    if source_key:
+                        try:
+                            custom_models = list_custom_models(cfg.source_endpoint, source_key)
+                            st.session_state.models_list = custom_models
+                            if st.session_state.models_list:
+                                st.success(f"✅ Found {len(st.session_state.models_list)} custom models in source")
+                                logger.info("Source models fetched: %s", [m['model_id'] for m in st.session_state.models_list])
                             else:
-                                st.error("Failed to create source DI client.")
-                        else:
-                            st.error("Failed to retrieve source API key.")
+                                st.info("No custom models found on the source resource.")
+                        except (ClientAuthenticationError, HttpResponseError) as e:
+                            show_di_error(e)
+                        except Exception as e:
+                            st.error(f"An error occurred while fetching source models: {e}")
                     else:
-                        st.error("Failed to connect to source Key Vault.")
+                        st.error("Failed to retrieve source API key.")
                 except Exception as e:
                     st.error(f"An unexpected error occurred: {e}")
     
@@ -503,8 +944,7 @@ with col1:
     if st.session_state.models_list:
         st.metric("Custom Models", len(st.session_state.models_list))
         with st.expander("📋 Source Model Details"):
-            for model in st.session_state.models_list:
-                st.write(f"• **{model.model_id}** - Created: {model.created_date_time.strftime('%Y-%m-%d %H:%M') if hasattr(model, 'created_date_time') and model.created_date_time else 'Unknown'}")
+            show_model_details(st.session_state.models_list)
     else:
         st.info("No models loaded. Use the refresh button above.")
 
@@ -517,73 +957,60 @@ with col2:
         st.info("Expected format: TARGET1_ENDPOINT, TARGET1_KV_URL, TARGET1_SECRET_NAME, etc.")
     else:
         # Create tabs for each target environment
-        target_tabs = st.tabs([config["name"] for config in configured_targets])
+        target_tabs = st.tabs([config.name for config in configured_targets])
         
         for i, (tab, target_config) in enumerate(zip(target_tabs, configured_targets)):
             with tab:
-                st.write(f"**Endpoint:** `{target_config['endpoint']}`")
-                st.write(f"**Key Vault:** `{target_config['kv_url']}`")
+                st.write(f"**Endpoint:** `{target_config.endpoint}`")
+                st.write(f"**Key Vault:** `{target_config.kv_url}`")
                 
                 # Individual refresh button for this target
-                if st.button(f"🔄 Refresh {target_config['name']} Models", key=f"refresh_{target_config['key']}", use_container_width=True):
-                    with st.spinner(f"Fetching {target_config['name']} models..."):
+                if st.button(f"🔄 Refresh {target_config.name} Models", key=f"refresh_{target_config.key}", use_container_width=True):
+                    with st.spinner(f"Fetching {target_config.name} models..."):
                         try:
-                            target_kv_client = get_secret_client(target_config['kv_url'])
-                            if target_kv_client:
-                                target_key = get_api_key_from_kv(target_kv_client, target_config['secret_name'])
-                                
-                                if target_key:
-                                    target_di_client = get_admin_client(target_config['endpoint'], target_key)
-                                    if target_di_client:
-                                        if test_di_connection(target_di_client):
-                                            try:
-                                                models = target_di_client.list_models()
-                                                custom_models = [m for m in models if hasattr(m, 'model_id') and not m.model_id.startswith('prebuilt-')]
-                                                st.session_state.target_models_lists[target_config['key']] = custom_models
-                                                if custom_models:
-                                                    st.success(f"✅ Found {len(custom_models)} custom models in {target_config['name']}")
-                                                    print(f"{target_config['name']} models fetched: {[m.model_id for m in custom_models]}")
-                                                else:
-                                                    st.info(f"No custom models found in {target_config['name']}.")
-                                            except Exception as e:
-                                                st.error(f"An error occurred while fetching {target_config['name']} models: {e}")
-                                        else:
-                                            st.error(f"Cannot proceed with {target_config['name']} model listing due to connection issues.")
+                            target_key = get_api_key_from_kv(target_config.kv_url, target_config.secret_name)
+
+                            if target_key:
+                                try:
+                                    custom_models = list_custom_models(target_config.endpoint, target_key)
+                                    st.session_state.target_models_lists[target_config.key] = custom_models
+                                    st.session_state.target_model_ids[target_config.key] = frozenset(m['model_id'] for m in custom_models)
+                                    if custom_models:
+                                        st.success(f"✅ Found {len(custom_models)} custom models in {target_config.name}")
+                                        logger.info("%s models fetched: %s", target_config.name, [m['model_id'] for m in custom_models])
                                     else:
-                                        st.error(f"Failed to create DI client for {target_config['name']}.")
-                                else:
-                                    st.error(f"Failed to retrieve API key for {target_config['name']}.")
+                                        st.info(f"No custom models found in {target_config.name}.")
+                                except (ClientAuthenticationError, HttpResponseError) as e:
+                                    show_di_error(e)
+                                except Exception as e:
+                                    st.error(f"An error occurred while fetching {target_config.name} models: {e}")
                             else:
-                                st.error(f"Failed to connect to {target_config['name']} Key Vault.")
+                                st.error(f"Failed to retrieve API key for {target_config.name}.")
                         except Exception as e:
                             st.error(f"An unexpected error occurred: {e}")
                 
                 # Show target model count and details
-                target_key = target_config['key']
+                target_key = target_config.key
                 if target_key in st.session_state.target_models_lists and st.session_state.target_models_lists[target_key]:
                     models = st.session_state.target_models_lists[target_key]
                     st.metric("Custom Models", len(models))
-                    with st.expander(f"📋 {target_config['name']} Model Details"):
-                        for model in models:
-                            st.write(f"• **{model.model_id}** - Created: {model.created_date_time.strftime('%Y-%m-%d %H:%M') if hasattr(model, 'created_date_time') and model.created_date_time else 'Unknown'}")
+                    with st.expander(f"📋 {target_config.name} Model Details"):
+                        show_model_details(models)
                 else:
                     st.info("No models loaded. Use the refresh button above.")
 
 st.markdown("---")
 
 # --- Model Selection and Copy Section ---
-st.header("🔄 Model Copy Operations")
-
-if not st.session_state.models_list:
-    st.info("Use the 'Refresh Models from Source and All Targets' button above or individual refresh buttons in each environment section to load models.")
-elif not configured_targets:
-    st.warning("No target environments configured. Please check your .env file.")
-else:
-    # Get target model IDs for each target environment
-    target_model_ids_by_target = {}
-    for target_key in st.session_state.target_models_lists:
-        target_models = st.session_state.target_models_lists[target_key]
-        target_model_ids_by_target[target_key] = set(model.model_id for model in target_models)
+@st.fragment
+def copy_operations_panel():
+    """
+    Renders the model selection table, copy options and copy button.
+    Runs as a fragment, so ticking models, typing a suffix or choosing targets reruns only
+    this panel rather than the whole page.
+    """
+    # Target model IDs for each target environment, kept up to date by the refresh handlers
+    target_model_ids_by_target = st.session_state.target_model_ids
     
     # Show all models (we'll indicate which ones exist in targets)
     available_models = st.session_state.models_list
@@ -591,86 +1018,17 @@ else:
     if not available_models:
         st.info("No models found in source.")
     else:
-        # Sort models by creation date (newest first)
-        sorted_models = sorted(
-            available_models,
-            key=lambda m: m.created_date_time if hasattr(m, 'created_date_time') and m.created_date_time else datetime.min.replace(tzinfo=timezone.utc),
-            reverse=True
-        )
+        # Already sorted by creation date (newest first) when listed
+        sorted_models = available_models
         
-        print(f"Available models for copying: {[m.model_id for m in sorted_models]}")
+        logger.info("Available models for copying: %s", [m['model_id'] for m in sorted_models])
         
-        # Create table data for display
-        import pandas as pd
-        from datetime import datetime, timezone
+        model_id_to_model = {model['model_id']: model for model in sorted_models}
         
-        table_data = []
-        model_id_to_model = {}
-        
-        # Create column configuration for data editor
-        column_config = {
-            "Select": st.column_config.CheckboxColumn(
-                "Select",
-                help="Check to select models for copying",
-                default=False,
-            ),
-            "Model ID": st.column_config.TextColumn(
-                "Model ID",
-                help="Source model identifier",
-                disabled=True,
-            ),
-            "Created Date": st.column_config.TextColumn(
-                "Created Date",
-                help="When the model was created",
-                disabled=True,
-            ),
-            "Target ID": st.column_config.TextColumn(
-                "Target ID",
-                help="Target model identifier (will be updated based on suffix)",
-                disabled=True,
-            ),
-        }
-        
-        # Add status columns for each configured target
-        disabled_columns = ["Model ID", "Created Date", "Target ID"]
-        for target_config in configured_targets:
-            target_key = target_config["key"]
-            column_name = f"{target_config['name']} Status"
-            column_config[column_name] = st.column_config.TextColumn(
-                column_name,
-                help=f"Model existence status in {target_config['name']}",
-                disabled=True,
-            )
-            disabled_columns.append(column_name)
-        
-        for model in sorted_models:
-            created_date = model.created_date_time.strftime('%Y-%m-%d %H:%M') if hasattr(model, 'created_date_time') and model.created_date_time else 'Unknown'
-            
-            # Create base row data
-            row_data = {
-                'Select': False,
-                'Model ID': model.model_id,
-                'Created Date': created_date,
-                'Target ID': model.model_id  # Default to same name as source
-            }
-            
-            # Add status for each target environment
-            for target_config in configured_targets:
-                target_key = target_config["key"]
-                column_name = f"{target_config['name']} Status"
-                
-                # Check if model exists in this target
-                if target_key in target_model_ids_by_target and model.model_id in target_model_ids_by_target[target_key]:
-                    row_data[column_name] = "✅ Exists"
-                elif target_key in st.session_state.target_models_lists:
-                    # Target models have been fetched and model doesn't exist
-                    row_data[column_name] = "❌ Not Found"
-                else:
-                    # Target models haven't been fetched yet
-                    row_data[column_name] = "❓ Unknown"
-            
-            table_data.append(row_data)
-            model_id_to_model[model.model_id] = model
+        # Column configuration for the data editor, built once per set of targets
+        column_config, disabled_columns = model_table_column_config(
+            tuple(target_config.name for target_config in configured_targets)
+        )
         
         # Display table with selection
         st.write(f"**{len(available_models)} Models Available for Copying (sorted by creation date):**")
@@ -680,21 +1038,31 @@ else:
             st.caption("**Status Legend:** ✅ Model exists in target | ❌ Model not found in target | ❓ Target not checked yet")
             st.info("💡 **Tip:** Use the 'Refresh Models from Source and All Targets' button above to update all environments at once, or use individual refresh buttons in each environment section for selective updates.")
         
-        # Create DataFrame for better display
-        df = pd.DataFrame(table_data)
+        # Status per target: the IDs found there, or None if that target hasn't been fetched
+        target_columns = tuple(
+            (f"{target_config.name} Status", target_model_ids_by_target.get(target_config.key))
+            for target_config in configured_targets
+        )
+        df = build_model_table(sorted_models, target_columns)
+        
+        # The suffix input sits below the table, so read its current value from its widget key
+        copy_suffix = st.session_state.get("copy_suffix", "")
+        if copy_suffix:
+            df['Target ID'] = df['Model ID'] + copy_suffix
         
-        # Use data_editor for interactive selection
+        # Use data_editor for interactive selection; the key keeps selections across suffix edits
         edited_df = st.data_editor(
             df,
             column_config=column_config,
             disabled=disabled_columns,
             hide_index=True,
             use_container_width=True,
-            height=min(400, len(table_data) * 35 + 70)  # Dynamic height based on row count
+            height=min(400, len(df) * 35 + 70),  # Dynamic height based on row count
+            key="models_editor"
         )
         
         # Get selected model IDs
-        selected_model_ids = [row['Model ID'] for _, row in edited_df.iterrows() if row['Select']]
+        selected_model_ids = edited_df.loc[edited_df['Select'], 'Model ID'].tolist()
         
         # Copy configuration section
         col_suffix, col_targets = st.columns([1, 2])
@@ -704,7 +1072,8 @@ else:
             copy_suffix = st.text_input(
                 "Suffix for copied models",
                 value="",
-                help="Optional suffix to append to each model ID in the target resource. Leave empty to use the same name as source."
+                help="Optional suffix to append to each model ID in the target resource. Leave empty to use the same name as source.",
+                key="copy_suffix"
             )
         
         with col_targets:
@@ -712,89 +1081,37 @@ else:
             st.write("**Select target environments:**")
             selected_targets = []
             for target_config in configured_targets:
-                if st.checkbox(target_config["name"], key=f"target_select_{target_config['key']}"):
+                if st.checkbox(target_config.name, key=f"target_select_{target_config.key}"):
                     selected_targets.append(target_config)
         
-        # Update the table data when suffix changes
-        if copy_suffix:
-            # Recreate table data with updated target IDs
-            updated_table_data = []
-            for model in sorted_models:
-                created_date = model.created_date_time.strftime('%Y-%m-%d %H:%M') if hasattr(model, 'created_date_time') and model.created_date_time else 'Unknown'
-                # Check if this model was previously selected
-                was_selected = model.model_id in selected_model_ids
-                
-                # Create base row data with updated target ID
-                row_data = {
-                    'Select': was_selected,
-                    'Model ID': model.model_id,
-                    'Created Date': created_date,
-                    'Target ID': f"{model.model_id}{copy_suffix}"
-                }
-                
-                # Add status for each target environment
-                for target_config in configured_targets:
-                    target_key = target_config["key"]
-                    column_name = f"{target_config['name']} Status"
-                    
-                    # Check if model exists in this target
-                    if target_key in target_model_ids_by_target and model.model_id in target_model_ids_by_target[target_key]:
-                        row_data[column_name] = "✅ Exists"
-                    elif target_key in st.session_state.target_models_lists:
-                        # Target models have been fetched and model doesn't exist
-                        row_data[column_name] = "❌ Not Found"
-                    else:
-                        # Target models haven't been fetched yet
-                        row_data[column_name] = "❓ Unknown"
-                
-                updated_table_data.append(row_data)
-            
-            # Update the DataFrame and display updated table
-            st.write("**Updated table with custom suffix:**")
-            updated_df = pd.DataFrame(updated_table_data)
-            
-            # Use data_editor for interactive selection with updated data
-            edited_df = st.data_editor(
-                updated_df,
-                column_config=column_config,
-                disabled=disabled_columns,
-                hide_index=True,
-                use_container_width=True,
-                height=min(400, len(updated_table_data) * 35 + 70),
-                key="updated_table"  # Different key to force re-render
-            )
-            
-            # Get updated selected model IDs
-            selected_model_ids = [row['Model ID'] for _, row in edited_df.iterrows() if row['Select']]
-        
         # Show summary of selected models and targets
         if selected_model_ids:
             st.success(f"✅ Selected {len(selected_model_ids)} models for copying")
-            print(f"Selected models: {selected_model_ids}")
+            logger.info("Selected models: %s", selected_model_ids)
             
             if selected_targets:
-                st.info(f"📍 Selected targets: {', '.join([t['name'] for t in selected_targets])}")
+                st.info(f"📍 Selected targets: {', '.join([t.name for t in selected_targets])}")
                 
                 with st.expander("📋 Copy Operation Summary"):
                     for model_id in selected_model_ids:
                         model = model_id_to_model[model_id]
-                        created_date = model.created_date_time.strftime('%Y-%m-%d %H:%M') if hasattr(model, 'created_date_time') and model.created_date_time else 'Unknown'
+                        created_date = model['created_date']
                         target_name = f"{model_id}{copy_suffix}" if copy_suffix else model_id
                         st.write(f"• **{model_id}** (Created: {created_date}) → `{target_name}`")
                         
                         # Show status for selected targets
                         for target in selected_targets:
-                            target_key = target["key"]
+                            target_key = target.key
                             if target_key in target_model_ids_by_target and model_id in target_model_ids_by_target[target_key]:
-                                st.warning(f"  ⚠️ Model already exists in {target['name']}")
+                                st.warning(f"  ⚠️ Model already exists in {target.name}")
                             elif target_key in st.session_state.target_models_lists:
-                                st.success(f"  ✅ Ready to copy to {target['name']}")
+                                st.success(f"  ✅ Ready to copy to {target.name}")
                             else:
-                                st.info(f"  ❓ {target['name']} models not checked yet")
+                                st.info(f"  ❓ {target.name} models not checked yet")
                     
                     st.write("**Will be copied to:**")
                     for target in selected_targets:
-                        st.write(f"  - {target['name']} ({target['endpoint']})")
+                        st.write(f"  - {target.name} ({target.endpoint})")
             else:
                 st.warning("Please select at least one target environment.")
 
@@ -811,173 +1128,112 @@ else:
             elif not selected_targets:
                 st.warning("Please select at least one target environment.")
             else:
-                # Get source key for the copy operation
-                source_kv_client = get_secret_client(source_kv_url)
-                source_key = get_api_key_from_kv(source_kv_client, source_secret_name) if source_kv_client else None
+                # Get the source and all target keys for the copy operation in one concurrent batch
+                source_key, *selected_target_keys = get_api_keys_from_kv(
+                    [(cfg.source_kv_url, cfg.source_secret_name)]
+                    + [(target.kv_url, target.secret_name) for target in selected_targets]
+                )
 
                 if not source_key:
                     st.error("Failed to retrieve source API key.")
                 else:
-                    source_di_client = get_admin_client(source_endpoint, source_key)
-                    if not source_di_client:
-                        st.error("Failed to create source DI client.")
-                    else:
-                        # Start the copy operation
-                        total_operations = len(selected_model_ids) * len(selected_targets)
-                        with st.status(f"Copying {len(selected_model_ids)} models to {len(selected_targets)} targets ({total_operations} total operations)...", expanded=True) as status:
-                            try:
-                                print(f"Starting multi-target copy operation: {len(selected_model_ids)} models to {len(selected_targets)} targets")
-                                st.write(f"Preparing to copy {len(selected_model_ids)} models to {len(selected_targets)} target environments...")
-                                
-                                all_results = {target['name']: {'successful': [], 'failed': []} for target in selected_targets}
-                                operation_count = 0
+                    # Start the copy operation
+                    total_operations = len(selected_model_ids) * len(selected_targets)
+                    with st.status(f"Copying {len(selected_model_ids)} models to {len(selected_targets)} targets ({total_operations} total operations)...", expanded=True) as copy_status:
+                        try:
+                            logger.info("Starting multi-target copy operation: %d models to %d targets", len(selected_model_ids), len(selected_targets))
+                            st.write(f"Preparing to copy {len(selected_model_ids)} models to {len(selected_targets)} target environments...")
+                            
+                            # One flat record per (model, target) outcome, aggregated once the run is over
+                            copy_results = []
+                            key_rejected = False
+                            operations = []
+                            # Target IDs and API versions depend only on the model, so work them out once
+                            model_copies = []
+                            for model_id in selected_model_ids:
+                                new_model_id = f"{model_id}{copy_suffix}" if copy_suffix else model_id
+                                model = model_id_to_model.get(model_id)
+                                model_api_version = get_api_version_from_model(model) if model else "2023-07-31"
+                                model_copies.append((model_id, new_model_id, model_api_version))
+                            
+                            for target_config, target_key in zip(selected_targets, selected_target_keys):
+                                # Target credentials were fetched up front alongside the source key
+                                if not target_key:
+                                    st.error(f"❌ Failed to retrieve API key for {target_config.name}")
+                                    copy_results.extend(
+                                        {"Target": target_config.name, "Model ID": model_id, "Target ID": "", "Result": COPY_FAILED, "Error": "Failed to retrieve target API key"}
+                                        for model_id in selected_model_ids
+                                    )
+                                    continue
                                 
-                                for target_config in selected_targets:
-                                    st.write(f"\n🎯 **Starting copy operations to {target_config['name']}**")
-                                    
-                                    # Get target credentials
-                                    target_kv_client = get_secret_client(target_config['kv_url'])
-                                    target_key = get_api_key_from_kv(target_kv_client, target_config['secret_name']) if target_kv_client else None
-                                    
-                                    if not target_key:
-                                        st.error(f"❌ Failed to retrieve API key for {target_config['name']}")
-                                        for model_id in selected_model_ids:
-                                            all_results[target_config['name']]['failed'].append({
-                                                "model_id": model_id, 
-                                                "error": "Failed to retrieve target API key"
-                                            })
-                                        continue
-                                    
-                                    target_di_client = get_admin_client(target_config['endpoint'], target_key)
-                                    if not target_di_client:
-                                        st.error(f"❌ Failed to create DI client for {target_config['name']}")
-                                        for model_id in selected_model_ids:
-                                            all_results[target_config['name']]['failed'].append({
-                                                "model_id": model_id, 
-                                                "error": "Failed to create target DI client"
-                                            })
+                                operations.extend(
+                                    (target_config, target_key, model_id, new_model_id, model_api_version)
+                                    for model_id, new_model_id, model_api_version in model_copies
+                                )
+                            
+                            # Copies are started together and polled together; outcomes are reported
+                            # here on the main thread as each one finishes
+                            st.write(f"🚀 Starting {len(operations)} copy operations (up to {MAX_CONCURRENT_COPIES} requests at a time)...")
+                            copy_progress = st.progress(0.0)
+                            # Only the latest outcome is shown while copying; the summary below lists them all
+                            latest_outcome = st.empty()
+                            copy_run = run_copy_operations(cfg.source_endpoint, source_key, operations)
+                            operation_count = started_count = 0
+                            try:
+                                for operation, result in copy_run:
+                                    if result is None:
+                                        started_count += 1
+                                        copy_status.update(label=f"Starting copies... {started_count}/{len(operations)} started")
                                         continue
-                                    
-                                    # Copy each model to this target
-                                    for model_id in selected_model_ids:
-                                        operation_count += 1
-                                        new_model_id = f"{model_id}{copy_suffix}" if copy_suffix else model_id
-                                        
-                                        # Get the model object to determine API version
-                                        model = model_id_to_model.get(model_id)
-                                        model_api_version = get_api_version_from_model(model) if model else "2023-07-31"
-                                        
-                                        st.write(f"[{operation_count}/{total_operations}] Copying '{model_id}' to '{new_model_id}' in {target_config['name']}...")
-                                        st.write(f"  📌 Using API version: {model_api_version}")
-                                        
-                                        # Step 1: Authorize copy on target
-                                        st.write(f"  🔑 Authorizing copy...")
-                                        copy_auth = authorize_copy_model(target_config['endpoint'], target_key, new_model_id, f"Copied from {source_endpoint} {model_id}", model_api_version)
-                                        
-                                        if "error" in copy_auth:
-                                            st.error(f"  ❌ Authorization failed: {copy_auth['error']}")
-                                            all_results[target_config['name']]['failed'].append({
-                                                "model_id": model_id,
-                                                "error": f"Authorization failed: {copy_auth['error']}"
-                                            })
-                                            continue
-                                        
-                                        # Step 2: Initiate copy from source
-                                        st.write(f"  📋 Initiating copy...")
-                                        copy_result = copy_model_to_target(source_endpoint, source_key, model_id, copy_auth, model_api_version)
-                                        
-                                        if "error" in copy_result:
-                                            st.error(f"  ❌ Copy initiation failed: {copy_result['error']}")
-                                            all_results[target_config['name']]['failed'].append({
-                                                "model_id": model_id, 
-                                                "error": f"Copy initiation failed: {copy_result['error']}"
-                                            })
-                                            continue
-                                        
-                                        operation_location = copy_result["operation_location"]
-                                        
-                                        # Step 3: Monitor copy status
-                                        st.write(f"  ⏳ Monitoring progress...")
-                                        max_attempts = 30
-                                        attempt = 0
-                                        copy_completed = False
-                                        
-                                        while attempt < max_attempts:
-                                            attempt += 1
-                                            status_result = check_copy_status(operation_location, source_key)
-                                            
-                                            if "error" in status_result:
-                                                st.error(f"  ❌ Status check failed: {status_result['error']}")
-                                                all_results[target_config['name']]['failed'].append({
-                                                    "model_id": model_id, 
-                                                    "error": f"Status check failed: {status_result['error']}"
-                                                })
-                                                break
-                                            
-                                            status = status_result.get('status', '').lower()
-                                            
-                                            if status == 'succeeded':
-                                                st.success(f"  ✅ Copy completed successfully!")
-                                                all_results[target_config['name']]['successful'].append({
-                                                    "model_id": model_id, 
-                                                    "new_model_id": new_model_id
-                                                })
-                                                copy_completed = True
-                                                break
-                                            elif status == 'failed':
-                                                error_info = status_result.get('error', {})
-                                                if isinstance(error_info, dict):
-                                                    error_msg = error_info.get('message', 'Unknown error')
-                                                else:
-                                                    error_msg = str(error_info)
-                                                st.error(f"  ❌ Copy failed: {error_msg}")
-                                                all_results[target_config['name']]['failed'].append({
-                                                    "model_id": model_id, 
-                                                    "error": error_msg
-                                                })
-                                                break
-                                            elif status in ['running', 'notstarted']:
-                                                if attempt % 5 == 0:
-                                                    st.write(f"  ⏳ Copy in progress... (attempt {attempt}/{max_attempts})")
-                                                time.sleep(2)
-                                            else:
-                                                st.write(f"  ❓ Unknown status: {status}")
-                                                time.sleep(2)
-                                        
-                                        if not copy_completed and attempt >= max_attempts:
-                                            st.warning(f"  ⏰ Copy operation timed out")
-                                            all_results[target_config['name']]['failed'].append({
-                                                "model_id": model_id, 
-                                                "error": "Copy operation timed out"
-                                            })
-                                
-                                # Display comprehensive summary
-                                st.write("\n" + "="*60)
-                                st.write("📊 **Multi-Target Copy Operation Summary:**")
-                                
-                                total_successful = sum(len(results['successful']) for results in all_results.values())
-                                total_failed = sum(len(results['failed']) for results in all_results.values())
-                                
-                                st.write(f"**Overall Results:** {total_successful} successful, {total_failed} failed out of {total_operations} total operations")
+                                    operation_count += 1
+                                    target_config, _, model_id, new_model_id, model_api_version = operation
                                 
-                                for target_name, results in all_results.items():
-                                    st.write(f"\n🎯 **{target_name}:**")
-                                    
-                                    if results['successful']:
-                                        st.success(f"✅ Successfully copied {len(results['successful'])} models:")
-                                        for copy in results['successful']:
-                                            st.write(f"  • {copy['model_id']} → {copy['new_model_id']}")
-                                    
-                                    if results['failed']:
-                                        st.error(f"❌ Failed to copy {len(results['failed'])} models:")
-                                        for copy in results['failed']:
-                                            st.write(f"  • {copy['model_id']}: {copy['error']}")
-                                    
-                                    if not results['successful'] and not results['failed']:
-                                        st.info("No operations performed for this target.")
-                                
-                                print(f"Multi-target copy operation completed: {total_successful} successful, {total_failed} failed")
-                                
-                            except Exception as e:
-                                st.error(f"An unexpected error occurred: {e}")
-                                print(f"Unexpected error: {e}")
\ No newline at end of file
+                                    progress = f"[{operation_count}/{len(operations)}] '{model_id}' → '{new_model_id}' in {target_config.name} (API {model_api_version})"
+                                    if "error" in result:
+                                        latest_outcome.write(f"{progress}: ❌ {result['error']}")
+                                        key_rejected = key_rejected or result.get("status_code") == 401
+                                        copy_results.append({"Target": target_config.name, "Model ID": model_id, "Target ID": "", "Result": COPY_FAILED, "Error": result['error']})
+                                    else:
+                                        latest_outcome.write(f"{progress}: ✅ Copy completed successfully!")
+                                        copy_results.append({"Target": target_config.name, "Model ID": model_id, "Target ID": new_model_id, "Result": COPY_SUCCEEDED, "Error": ""})
+                                    copy_status.update(label=f"Copying... {operation_count}/{len(operations)} operations finished")
+                                    copy_progress.progress(operation_count / len(operations))
+                            finally:
+                                # A Stop or rerun interrupts the loop at its next st.* call; closing the
+                                # run cancels the copies that have not been started yet
+                                copy_run.close()
+                        
+                            # Display comprehensive summary
+                            results_frame = copy_results_frame(copy_results, [target.name for target in selected_targets])
+                            result_counts = copy_result_counts(results_frame)
+                            total_successful = int(result_counts[COPY_SUCCEEDED].sum())
+                            total_failed = int(result_counts[COPY_FAILED].sum())
+                            st.markdown(copy_summary_markdown(result_counts, total_operations, total_successful, total_failed))
+                            st.dataframe(results_frame, use_container_width=True, hide_index=True)
+                            
+                            logger.info("Multi-target copy operation completed: %d successful, %d failed", total_successful, total_failed)
+                            copy_status.update(
+                                label=f"Copy finished: {total_successful} successful, {total_failed} failed out of {total_operations} operations",
+                                state="error" if total_failed else "complete",
+                            )
+                            if total_successful:
+                                # Cached target listings no longer reflect the copied models
+                                list_custom_models.clear()
+                            if key_rejected:
+                                # Same as show_di_error: a rejected key may have been rotated, so re-read
+                                # it from Key Vault on the next attempt instead of after the cache TTL
+                                _fetch_secret.clear()
+                                st.info("🔑 An API key was rejected (HTTP 401); keys will be re-read from Key Vault on the next attempt.")
+                            
+                        except Exception as e:
+                            st.error(f"An unexpected error occurred: {e}")
+                            logger.exception("Unexpected error: %s", e)
+
+st.header("🔄 Model Copy Operations")
+
+if not st.session_state.models_list:
+    st.info("Use the 'Refresh Models from Source and All Targets' button above or individual refresh buttons in each environment section to load models.")
+elif not configured_targets:
+    st.warning("No target environments configured. Please check your .env file.")
+else:
+    copy_operations_panel()